@@ -16,12 +16,14 @@ Console output (per domain):
   Excel Path
 
 Requires binaries in PATH: subfinder, httpx
-Python deps: pandas, openpyxl, tabulate, pyfiglet
+Python deps: openpyxl, tabulate, pyfiglet, termcolor
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import contextlib
 import logging
 import os
 import re
@@ -29,18 +31,22 @@ import shutil
 import subprocess
 import sys
 from dataclasses import dataclass
-import pyfiglet
-from termcolor import colored
 
-from typing import Dict, Iterable, List, Sequence, Set
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
-import pandas as pd
-from tabulate import tabulate
+# openpyxl, pyfiglet, termcolor and tabulate are imported where they are used
+# so that `-h` and argument errors don't pay for loading them
+if TYPE_CHECKING:
+    import openpyxl
 
 LOG = logging.getLogger("sub_pro")
 
+WRITE_BUFSIZE = 1 << 20
+STREAM_LIMIT = 1 << 20  # max bytes per line read from a tool's stdout
+
 ANSI_RE = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
-BRACKET_RE = re.compile(r'\[([^\]]+)\]')
+SAFE_NAME_RE = re.compile(r"[^a-z0-9\-_]")
+DASH_RUN_RE = re.compile(r"-{2,}")
 
 
 # ---------------- Utilities ----------------
@@ -61,28 +67,90 @@ def which_or_die(bin_name: str) -> str:
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
-def write_lines(path: str, lines: Iterable[str]) -> None:
-    ensure_dir(os.path.dirname(path) or ".")
-    with open(path, "w", encoding="utf-8") as f:
-        for ln in lines:
-            f.write(ln.rstrip("\n") + "\n")
+def write_lines(path: str, lines: Iterable[str], ensure_parent: bool = True) -> None:
+    if ensure_parent:
+        ensure_dir(os.path.dirname(path) or ".")
+    out = [ln.rstrip("\n") for ln in lines]
+    if out:
+        out.append("")  # trailing newline
+    # one encode + one write instead of a text-layer write per line
+    with open(path, "wb", buffering=WRITE_BUFSIZE) as f:
+        f.write("\n".join(out).encode("utf-8"))
+
+def kill_quietly(proc: asyncio.subprocess.Process) -> None:
+    try:
+        proc.kill()
+    except ProcessLookupError:  # already exited
+        pass
+
+async def run_subprocess(cmd: Sequence[str], timeout: int = 0) -> subprocess.CompletedProcess:
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout=(timeout or None))
+    except asyncio.TimeoutError:
+        kill_quietly(proc)
+        await proc.wait()
+        return subprocess.CompletedProcess(cmd, returncode=124, stdout="", stderr=f"timed out after {timeout}s")
+    return subprocess.CompletedProcess(
+        cmd, returncode=proc.returncode,
+        stdout=out.decode("utf-8", "replace"), stderr=err.decode("utf-8", "replace"),
+    )
+
+async def stream_subprocess(cmd: Sequence[str], input_lines: Iterable[str], timeout: int = 0,
+                            flush_every: int = 0) -> AsyncIterator[str]:
+    """Run cmd, feeding input_lines on stdin, and yield stripped stdout lines as they arrive.
+
+    Each input line is encoded and written on its own, so no joined copy of the
+    whole input is ever built. stdin is drained every flush_every lines (every
+    line when 0) so the transport buffer stays bounded.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,  # never read; a PIPE here could fill up and stall the tool
+        limit=STREAM_LIMIT,
+    )
 
-def run_subprocess(cmd: Sequence[str], input_text: str = "", timeout: int = 0) -> subprocess.CompletedProcess:
+    # stdin is fed from its own task so a full stdout pipe can't deadlock us
+    async def feed() -> None:
+        try:
+            write, drain = proc.stdin.write, proc.stdin.drain
+            for n, ln in enumerate(input_lines, start=1):
+                write(ln.encode("utf-8"))
+                write(b"\n")
+                if not flush_every or n % flush_every == 0:
+                    await drain()
+            await drain()
+            proc.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):  # tool exited (or was killed) early
+            pass
+
+    feeder = asyncio.ensure_future(feed())
+    killer = asyncio.get_running_loop().call_later(timeout, kill_quietly, proc) if timeout else None
     try:
-        return subprocess.run(
-            cmd,
-            input=(input_text or None),
-            text=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=False,
-            timeout=(timeout or None),
-        )
-    except subprocess.TimeoutExpired as e:
-        return subprocess.CompletedProcess(cmd, returncode=124, stdout="", stderr=str(e))
+        async for raw in proc.stdout:
+            ln = raw.decode("utf-8", "replace").strip()
+            if ln:
+                yield ln
+    except BaseException:
+        kill_quietly(proc)
+        raise
+    finally:
+        if killer:
+            killer.cancel()
+        await proc.wait()
+        if not feeder.done():
+            feeder.cancel()
+        await asyncio.gather(feeder, return_exceptions=True)
 
 def strip_ansi(s: str) -> str:
-    return ANSI_RE.sub("", s)
+    # most lines carry no escapes at all; skip the regex for those
+    return ANSI_RE.sub("", s) if "\x1b" in s else s
 
 def domain_folder_name(domain: str) -> str:
     d = domain.strip().lower()
@@ -90,41 +158,81 @@ def domain_folder_name(domain: str) -> str:
     if len(parts) >= 2:
         parts = parts[:-1]  # drop TLD for folder name
     name = "-".join(parts) if parts else d
-    name = re.sub(r"[^a-z0-9\-_]", "-", name)
-    name = re.sub(r"-{2,}", "-", name).strip("-")
+    name = SAFE_NAME_RE.sub("-", name)
+    name = DASH_RUN_RE.sub("-", name).strip("-")
     return name or "domain"
 
-def chunked(seq: Sequence[str], size: int) -> Iterable[List[str]]:
-    for i in range(0, len(seq), size):
-        yield seq[i:i+size]
-
 
 # ---------------- Tool wrappers ----------------
 
-def subfinder_domains(subfinder_bin: str, domain: str, threads: int, timeout: int) -> List[str]:
+async def subfinder_domains(subfinder_bin: str, domain: str, threads: int, timeout: int) -> List[str]:
     cmd = [subfinder_bin, "-silent", "-d", domain]
     if threads > 0:
         cmd += ["-t", str(threads)]
-    cp = run_subprocess(cmd, timeout=timeout)
-    return sorted(set([ln.strip() for ln in cp.stdout.splitlines() if ln.strip()]))
-
-def httpx_probe(httpx_bin: str, hosts: Sequence[str], threads: int,
-                batch_size: int, timeout: int) -> List[str]:
+    cp = await run_subprocess(cmd, timeout=timeout)
+    # dedupe in subfinder's output order; nothing downstream needs them sorted
+    subs = dict.fromkeys(ln.strip() for ln in cp.stdout.splitlines())
+    subs.pop("", None)
+    return list(subs)
+
+async def httpx_probe(httpx_bin: str, hosts: Sequence[str], threads: int,
+                      batch_size: int, timeout: int, shards: int = 1) -> AsyncIterator[str]:
     if not hosts:
-        return []
-    all_out: List[str] = []
-    # avoid huge stdin hangs by batching
-    for i in range(0, len(hosts), batch_size):
-        batch = hosts[i:i+batch_size]
-        input_text = "\n".join(batch) + "\n"
-        cmd = [httpx_bin, "-silent", "-tech-detect", "-status-code"]
-        if threads > 0:
-            cmd += ["-threads", str(threads)]
-        # ask tools to avoid colors; we still strip ANSI anyway
-        env = dict(os.environ); env = env  # (kept for clarity; not used with run_subprocess)
-        cp = run_subprocess(cmd, input_text=input_text, timeout=timeout)
-        all_out.extend([ln.strip() for ln in cp.stdout.splitlines() if ln.strip()])
-    return all_out
+        return
+    # one httpx per shard (per domain by default); its own -threads handles
+    # concurrency, split evenly across shards
+    shards = max(1, min(shards, len(hosts)))
+    if shards > 1 and threads > 0:
+        threads = max(1, threads // shards)
+    cmd = [httpx_bin, "-silent", "-tech-detect", "-status-code"]
+    if threads > 0:
+        cmd += ["-threads", str(threads)]
+
+    def run(part: Sequence[str]) -> AsyncIterator[str]:
+        return stream_subprocess(cmd, part, timeout=timeout, flush_every=batch_size)
+
+    if shards == 1:
+        lines = run(hosts)
+        try:
+            async for ln in lines:
+                yield ln
+        finally:
+            await lines.aclose()
+        return
+
+    # merge shard outputs through a queue; None marks a finished shard
+    q: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+    async def pump(part: Sequence[str]) -> None:
+        lines = run(part)
+        try:
+            async for ln in lines:
+                q.put_nowait(ln)
+        finally:
+            await lines.aclose()
+            q.put_nowait(None)
+
+    seen: Set[str] = set()
+    tasks = [asyncio.ensure_future(pump(hosts[k::shards])) for k in range(shards)]
+    try:
+        remaining = shards
+        while remaining:
+            ln = await q.get()
+            if ln is None:
+                remaining -= 1
+                continue
+            # shards are disjoint, but don't report a host twice if httpx does
+            url = strip_ansi(ln).split(" ", 1)[0]
+            if url in seen:
+                continue
+            seen.add(url)
+            yield ln
+        for t in tasks:
+            await t  # surface shard errors
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 # ---------------- Parsing ----------------
@@ -132,41 +240,46 @@ def httpx_probe(httpx_bin: str, hosts: Sequence[str], threads: int,
 @dataclass
 class ProbedRow:
     url: str
-    status: str
+    status: Optional[int]
     tech: str
 
 def parse_httpx_line(line: str) -> ProbedRow:
-    clean = strip_ansi(line)
-    parts = clean.split()
-    url = parts[0] if parts else clean.strip()
-    status = ""
+    # e.g. "https://a.example.com [200] [nginx,cloudflare]" -- scanned by hand,
+    # this runs once per probed host
+    clean = strip_ansi(line).strip()
+    sp = clean.find(" ")
+    url = clean if sp < 0 else clean[:sp]
+    status: Optional[int] = None
     tech_tokens: List[str] = []
-    for tok in BRACKET_RE.findall(clean):
-        if tok.isdigit() and not status:
-            status = tok
-        else:
-            tech_tokens.append(tok.strip())
+    find = clean.find
+    i = find("[")
+    while i >= 0:
+        j = find("]", i + 1)
+        if j < 0:
+            break
+        tok = clean[i+1:j]
+        if tok:
+            if tok.isdigit() and status is None:
+                status = int(tok)
+            else:
+                tech_tokens.append(tok.strip())
+        i = find("[", j + 1)
     return ProbedRow(url=url, status=status, tech=", ".join(tech_tokens).strip(", "))
 
-def filter_by_status(lines: Sequence[str], statuses: Set[str]) -> List[str]:
-    return [ln for ln in lines if parse_httpx_line(ln).status in statuses]
-
 
 # ---------------- Excel export ----------------
 
-def write_probed_excel(probed_lines: Sequence[str], xlsx_path: str) -> None:
-    rows = []
-    for i, ln in enumerate(probed_lines, start=1):
-        r = parse_httpx_line(ln)
-        rows.append({
-            "Sno": i,
-            "Subdomain Name": r.url,
-            "Status Code": r.status,
-            "Technology": r.tech,
-        })
-    df = pd.DataFrame(rows, columns=["Sno", "Subdomain Name", "Status Code", "Technology"])
-    with pd.ExcelWriter(xlsx_path, engine="openpyxl") as w:
-        df.to_excel(w, index=False, sheet_name="probed")
+EXCEL_HEADER = ("Sno", "Subdomain Name", "Status Code", "Technology")
+
+def new_probed_sheet() -> Tuple[openpyxl.Workbook, Any]:
+    # write-only mode streams appended rows to a temp file instead of holding
+    # the sheet in memory, so rows can be added as httpx reports them
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("probed")
+    ws.append(EXCEL_HEADER)
+    return wb, ws
 
 
 # ---------------- Pipeline ----------------
@@ -177,28 +290,54 @@ class DomainCounts:
     found: int
     probed: int
     filtered: int
-    excel_path: str
+    excel_path: Optional[str]  # None when the Excel report was skipped
 
-def process_domain(domain: str, outdir: str, statuses: Set[str],
-                   subfinder_bin: str, httpx_bin: str,
-                   threads: int, batch_size: int, timeout: int) -> DomainCounts:
+async def process_domain(domain: str, outdir: str, statuses: Set[int],
+                         subfinder_bin: str, httpx_bin: str,
+                         threads: int, batch_size: int, timeout: int,
+                         shards: int = 1, write_probed: bool = True,
+                         write_excel: bool = True) -> DomainCounts:
     folder = domain_folder_name(domain)
     d_out = os.path.join(outdir, folder)
     ensure_dir(d_out)
 
-    subs = subfinder_domains(subfinder_bin, domain, threads, timeout)
-    write_lines(os.path.join(d_out, f"{domain}-all.txt"), subs)
-
-    probed = httpx_probe(httpx_bin, subs, threads, batch_size, timeout)
-    write_lines(os.path.join(d_out, f"{domain}-probed.txt"), probed)
-
-    filtered = filter_by_status(probed, statuses)
-    write_lines(os.path.join(d_out, f"{domain}-filtered.txt"), filtered)
-
-    xlsx = os.path.join(d_out, f"{domain}-probed.xlsx")
-    write_probed_excel(probed, xlsx)
+    subs = await subfinder_domains(subfinder_bin, domain, threads, timeout)
+    write_lines(os.path.join(d_out, f"{domain}-all.txt"), subs, ensure_parent=False)
 
-    return DomainCounts(domain, len(subs), len(probed), len(filtered), os.path.abspath(xlsx))
+    # single pass over httpx output: parse once, then tee to probed.txt,
+    # filtered.txt and the Excel sheet while httpx is still running;
+    # probed.txt and the sheet can be switched off
+    wb, ws = new_probed_sheet() if write_excel else (None, None)
+    probed = filtered = 0
+    lines = httpx_probe(httpx_bin, subs, threads, batch_size, timeout, shards)
+    try:
+        with contextlib.ExitStack() as stack:
+            probed_fp = stack.enter_context(open(
+                os.path.join(d_out, f"{domain}-probed.txt"), "w", encoding="utf-8",
+                buffering=WRITE_BUFSIZE)) if write_probed else None
+            filtered_fp = stack.enter_context(open(
+                os.path.join(d_out, f"{domain}-filtered.txt"), "w", encoding="utf-8",
+                buffering=WRITE_BUFSIZE))
+            async for ln in lines:
+                r = parse_httpx_line(ln)
+                if probed_fp:
+                    probed_fp.write(ln + "\n")
+                if r.status in statuses:
+                    filtered_fp.write(ln + "\n")
+                    filtered += 1
+                probed += 1
+                if ws:
+                    ws.append((probed, r.url, r.status, r.tech))
+    finally:
+        await lines.aclose()  # stop httpx right away if writing failed
+
+    xlsx: Optional[str] = None
+    if wb:
+        # serializing the workbook is the one CPU-heavy step; keep it off the loop
+        xlsx = os.path.abspath(os.path.join(d_out, f"{domain}-probed.xlsx"))
+        await asyncio.get_running_loop().run_in_executor(None, wb.save, xlsx)
+
+    return DomainCounts(domain, len(subs), probed, filtered, xlsx)
 
 
 # ---------------- CLI ----------------
@@ -209,15 +348,73 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--outdir", default=".", help="Base directory for outputs")
     p.add_argument("--status", default="200,301,401,403", help="Comma-separated status codes for filtered.txt")
     p.add_argument("--threads", type=int, default=0, help="Threads for subfinder/httpx (0 = tool default)")
-    p.add_argument("--httpx-batch-size", type=int, default=500, help="Hosts per httpx invocation (default: 500)")
+    p.add_argument("--httpx-batch-size", type=int, default=500, help="Hosts written to httpx stdin per flush (default: 500)")
+    p.add_argument("--httpx-shards", type=int, default=1, help="Parallel httpx processes per domain (default: 1)")
     p.add_argument("--timeout", type=int, default=0, help="Per-process timeout seconds (0 = none)")
+    p.add_argument("--domain-concurrency", type=int, default=4, help="Domains processed in parallel (default: 4)")
+    p.add_argument("--no-excel", action="store_true", help="Skip the Excel report")
+    p.add_argument("--filtered-only", action="store_true", help="Only write -all.txt and -filtered.txt (implies --no-excel)")
     p.add_argument("-v", "--verbose", action="store_true", help="Verbose logging")
     return p.parse_args()
 
+def print_counts(c: DomainCounts) -> None:
+    from tabulate import tabulate
+
+    # Boxed (grid) vertical table per domain
+    rows = [
+        ["Domain", c.domain],
+        ["Total Domains Found", c.found],
+        ["Probed Domains", c.probed],
+        ["Filtered Domains", c.filtered],
+    ]
+    if c.excel_path:
+        rows.append(["Excel Path", c.excel_path])
+    print(tabulate(rows, tablefmt="grid"))
+    print()  # blank line between domains
+
+async def run_domains(args: argparse.Namespace, statuses: Set[int],
+                      subfinder_bin: str, httpx_bin: str) -> int:
+    """Process all domains, at most args.domain_concurrency at a time; return the failure count."""
+    sem = asyncio.Semaphore(max(1, args.domain_concurrency))
+
+    async def guarded(domain: str) -> Optional[DomainCounts]:
+        async with sem:
+            try:
+                return await process_domain(
+                    domain=domain,
+                    outdir=args.outdir,
+                    statuses=statuses,
+                    subfinder_bin=subfinder_bin,
+                    httpx_bin=httpx_bin,
+                    threads=args.threads,
+                    batch_size=args.httpx_batch_size,
+                    timeout=args.timeout,
+                    shards=args.httpx_shards,
+                    write_probed=not args.filtered_only,
+                    write_excel=not (args.no_excel or args.filtered_only),
+                )
+            except Exception as e:  # one bad domain shouldn't sink the rest
+                LOG.error(f"Failed to process {domain}: {e}")
+                return None
+
+    failed = 0
+    # tables are printed as domains finish, from this one coroutine, so
+    # output from concurrent domains never interleaves
+    for fut in asyncio.as_completed([guarded(d) for d in args.domains]):
+        c = await fut
+        if c is None:
+            failed += 1
+        else:
+            print_counts(c)
+    return failed
+
 def main() -> None:
     args = parse_args()
     setup_logging(args.verbose)
 
+    import pyfiglet
+    from termcolor import colored
+
     # Banner
     ascii_banner = pyfiglet.figlet_format("Sub - Pro")
     print(colored(ascii_banner, "cyan"))
@@ -227,30 +424,10 @@ def main() -> None:
     httpx_bin = which_or_die("httpx")
     ensure_dir(args.outdir)
 
-    statuses = {s.strip() for s in args.status.split(",") if s.strip().isdigit()}
-
-    for domain in args.domains:
-        c = process_domain(
-            domain=domain,
-            outdir=args.outdir,
-            statuses=statuses,
-            subfinder_bin=subfinder_bin,
-            httpx_bin=httpx_bin,
-            threads=args.threads,
-            batch_size=args.httpx_batch_size,
-            timeout=args.timeout,
-        )
-
-        # Boxed (grid) vertical table per domain
-        rows = [
-            ["Domain", c.domain],
-            ["Total Domains Found", c.found],
-            ["Probed Domains", c.probed],
-            ["Filtered Domains", c.filtered],
-            ["Excel Path", c.excel_path],
-        ]
-        print(tabulate(rows, tablefmt="grid"))
-        print()  # blank line between domains
+    statuses = {int(s) for s in args.status.split(",") if s.strip().isdigit()}
+
+    if asyncio.run(run_domains(args, statuses, subfinder_bin, httpx_bin)):
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()